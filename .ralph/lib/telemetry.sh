@@ -35,7 +35,8 @@ set -euo pipefail
 #   Depends on: jq, log() from ralph.sh
 #   Optionally calls: set_task_status() from plan-ops.sh (for skip-task)
 #   Globals read/write: RALPH_PAUSED (controls pause/resume blocking)
-#   Files written: .ralph/logs/events.jsonl (append), .ralph/control/commands.json (read+clear)
+#   Files written: .ralph/logs/events.jsonl (append), .ralph/control/commands.json (read+clear),
+#     .ralph/control/commands.lock (flock shared with serve.py)
 #
 # CONTROL FLOW:
 #   Dashboard POST → serve.py enqueue_command() → commands.json pending[]
@@ -117,20 +118,38 @@ read_pending_commands() {
 }
 
 # Reset the pending array in the control file after processing.
-# Uses temp-file-then-rename pattern for atomicity with concurrent serve.py writes.
+# Args: $1 = number of leading commands to drop (optional; default: all).
+#   Passing the count that was actually processed keeps commands serve.py
+#   appended in the meantime queued for the next poll.
+# Uses temp-file-then-rename pattern for atomicity with concurrent serve.py writes,
+# under an flock(1) on commands.lock (the lock serve.py takes) when available.
 clear_pending_commands() {
     local control_file="${RALPH_CONTROL_FILE:-.ralph/control/commands.json}"
+    local processed="${1:-null}"
     if [[ -f "$control_file" ]]; then
+        local lock_file="${control_file%.json}.lock"
         local tmp
         tmp="$(mktemp)"
-        jq '.pending = []' "$control_file" > "$tmp" && mv "$tmp" "$control_file"
+        if command -v flock >/dev/null 2>&1; then
+            (
+                flock 9
+                jq --argjson n "$processed" \
+                    '.pending |= (if $n == null then [] else .[$n:] end)' \
+                    "$control_file" > "$tmp" && mv "$tmp" "$control_file"
+            ) 9>>"$lock_file"
+        else
+            jq --argjson n "$processed" \
+                '.pending |= (if $n == null then [] else .[$n:] end)' \
+                "$control_file" > "$tmp" && mv "$tmp" "$control_file"
+        fi
     fi
 }
 
 # Read, execute, and clear all pending commands.
 # Command types: pause, resume, inject-note, skip-task
 # SIDE EFFECT: Sets RALPH_PAUSED=true/false. May call set_task_status() for skip.
-# INVARIANT: After return, pending[] is empty regardless of command outcomes.
+# INVARIANT: After return, every command that was read is gone from pending[]
+#   regardless of outcome; commands enqueued while processing stay queued.
 # MALFORMED/STALE COMMAND HANDLING:
 #   - Unknown command keys are logged and ignored (non-fatal).
 #   - Missing optional fields fall back to defaults (note/task_id).
@@ -203,7 +222,7 @@ process_control_commands() {
         i=$((i + 1))
     done
 
-    clear_pending_commands
+    clear_pending_commands "$count"
 }
 
 # Block execution while RALPH_PAUSED is true.
@@ -5,8 +5,8 @@ Endpoints / served assets:
   - GET /*: serves static assets from the repository root, including
     .ralph/dashboard.html plus polled state files such as .ralph/state.json,
     .ralph/progress-log.json, .ralph/handoffs/*.json, and .ralph/logs/events.jsonl.
-  - POST /api/command: accepts a JSON command object from the dashboard and appends it
-    to .ralph/control/commands.json.
+  - POST /api/command: accepts a JSON command object from the dashboard (or a batch
+    as {"commands": [...]}) and appends it to .ralph/control/commands.json.
   - POST /api/settings: accepts a JSON object of setting updates and applies only
     whitelisted keys in .ralph/config/ralph.conf.
 
@@ -16,10 +16,15 @@ Files read / written for control and config:
     .ralph/config/ralph.conf (whitelisted setting updates).
   - Writes are atomic (temp-file + os.replace) so orchestrator readers never observe
     partially-written JSON/config content.
+  - Command writes are coalesced: a background thread flushes every command that
+    arrived within ~10ms in one write, so /api/command replies before the file
+    changes.
 
 Polling / interaction expectations:
   - dashboard.html polls state and log files on a recurring cadence (currently 3s)
-    via GET requests served by this process.
+    via GET requests served by this process. Connections are HTTP/1.1
+    keep-alive and each one is handled on its own thread. Static responses
+    carry a stat-derived ETag; unchanged files are answered with 304.
   - The dashboard sends operator actions via POST /api/command; the orchestrator is
     expected to consume and clear queued commands from .ralph/control/commands.json.
   - Settings edits flow dashboard -> POST /api/settings -> .ralph/config/ralph.conf,
@@ -27,72 +32,528 @@ Polling / interaction expectations:
 """
 
 import argparse
+import asyncio
+import contextlib
+import hashlib
+import itertools
 import json
+import mimetypes
+import mmap
 import os
+import queue
 import re
+import socket
+import stat
 import sys
-import tempfile
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
+# Optional: orjson serializes straight to UTF-8 bytes and parses bytes without
+# a decode step. The stdlib fallback keeps serve.py dependency-free.
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+# Advisory locking for commands.json: fcntl on POSIX, msvcrt on Windows
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Optional: uvicorn runs asgi_app on an event loop; without it main() falls
+# back to the stdlib ThreadingHTTPServer.
+try:
+    import uvicorn
+except ImportError:  # pragma: no cover - depends on environment
+    uvicorn = None
+
 
 # Resolve project root: serve.py lives at .ralph/serve.py, so root is parent
 SCRIPT_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 CONTROL_FILE = SCRIPT_DIR / "control" / "commands.json"
 CONFIG_FILE = SCRIPT_DIR / "config" / "ralph.conf"
+# Shared with telemetry.sh clear_pending_commands(), which takes the same lock
+CONTROL_LOCK_FILE = CONTROL_FILE.with_suffix(".lock")
+
+# In-memory copy of commands.json, written by the background writer thread.
+# _CONTROL_STAT is the (inode, mtime_ns, size) of the file when the cache was
+# filled; the orchestrator clears the queue by replacing the file, which
+# changes that signature and forces a reload.
+_CONTROL_LOCK = threading.Lock()
+_CONTROL_STATE = None
+_CONTROL_STAT = None
+
+# Handler threads put accepted command batches on _write_queue; a single
+# writer thread waits _COALESCE_SECONDS after the first arrival, drains
+# everything queued meanwhile and flushes it with one atomic_write.
+_write_queue = queue.Queue()
+_writer_thread = None
+_WRITER_START_LOCK = threading.Lock()
+_COALESCE_SECONDS = 0.010
+# A failed flush keeps its batches and retries after this long, so one bad
+# write never loses commands that other requests were already told are queued.
+_RETRY_SECONDS = 1.0
+# How long shutdown waits for the writer before giving up on what is left
+_FLUSH_TIMEOUT_SECONDS = 5.0
+
+# commands.json is read by jq, not people, so it is written compact;
+# RALPH_PRETTY_JSON=true restores indented output for debugging.
+_PRETTY_CONTROL_JSON = os.environ.get("RALPH_PRETTY_JSON", "").lower() in ("1", "true")
+
+# Serializes update_settings across handler threads; the durable write's
+# hash check still catches edits made outside this process.
+_CONFIG_LOCK = threading.Lock()
+
+# Operator commands and settings are tiny JSON objects; anything larger is
+# rejected from the Content-Length header alone, before reading the body.
+MAX_BODY = 64 * 1024
+
+# Per-process sequence for atomic_write temp names
+_TMP_COUNTER = itertools.count()
+
+# Commands telemetry.sh process_control_commands() knows how to execute
+_VALID_COMMANDS = frozenset({"pause", "resume", "inject-note", "skip-task"})
+
+# Whitelist: only these settings can be changed from the dashboard
+ALLOWED_SETTINGS = frozenset({
+    "RALPH_VALIDATION_STRATEGY",
+    "RALPH_COMPACTION_INTERVAL",
+    "RALPH_COMPACTION_THRESHOLD_BYTES",
+    "RALPH_DEFAULT_MAX_TURNS",
+    "RALPH_MIN_DELAY_SECONDS",
+    "RALPH_MODE",
+})
+# Compiled once at import so update_settings does no regex compilation.
+# \Z (not $) so a trailing newline cannot slip into the quoted value.
+_VALUE_RE = re.compile(r'^[a-zA-Z0-9_\-]+\Z')
+
+
+# orjson differs from the stdlib in two ways that matter here:
+#   - integers outside [-2**63, 2**64 - 1] parse as floats, and dumps()
+#     rejects them outright;
+#   - dumps() fails past 254 levels of nesting, far below the stdlib's
+#     recursion limit.
+# _loads() evens this out so both backends accept the same documents: the
+# fallback parses oversized integers as floats too, and both reject anything
+# nested deeper than _MAX_JSON_DEPTH. The cap leaves headroom for the two
+# levels commands.json adds around each queued command ({"pending": [...]}).
+_MAX_JSON_DEPTH = 128
+_INT_MIN, _INT_MAX = -(2 ** 63), 2 ** 64 - 1
+
+
+def _check_depth(obj, raw: bytes) -> None:
+    """Raise json.JSONDecodeError if obj nests deeper than _MAX_JSON_DEPTH."""
+    # Every container opens with [ or {, so a document with at most that many
+    # brackets cannot be too deep and skips the walk.
+    if raw.count(b"[") + raw.count(b"{") <= _MAX_JSON_DEPTH:
+        return
+    stack = [(obj, 1)]
+    while stack:
+        node, depth = stack.pop()
+        if isinstance(node, dict):
+            node = node.values()
+        elif not isinstance(node, list):
+            continue
+        if depth > _MAX_JSON_DEPTH:
+            raise json.JSONDecodeError(f"Nesting exceeds {_MAX_JSON_DEPTH} levels", "", 0)
+        stack.extend((child, depth + 1) for child in node)
+
+
+def _parse_int(text: str):
+    value = int(text)
+    return value if _INT_MIN <= value <= _INT_MAX else float(value)
+
+
+if orjson is not None:
+    def _dumps(obj, pretty: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+    def _loads(raw: bytes):
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+        # keep catching the stdlib exception type.
+        obj = orjson.loads(raw)
+        _check_depth(obj, raw)
+        return obj
+else:
+    def _dumps(obj, pretty: bool = False) -> bytes:
+        if pretty:
+            return json.dumps(obj, indent=2).encode("utf-8")
+        # Match orjson's compact output
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def _loads(raw: bytes):
+        try:
+            obj = json.loads(raw, parse_int=_parse_int)
+        except RecursionError:
+            raise json.JSONDecodeError(
+                f"Nesting exceeds {_MAX_JSON_DEPTH} levels", "", 0
+            ) from None
+        _check_depth(obj, raw)
+        return obj
 
 
-def atomic_write(filepath: Path, data: str) -> None:
-    """Write data atomically via temp-file-then-rename.
+# Fixed API error bodies, encoded once at import for _send_raw_json
+_ERR_INVALID_JSON = _dumps({"error": "Invalid JSON"})
+_ERR_NOT_OBJECT = _dumps({"error": "Expected a JSON object"})
+_ERR_MISSING_COMMAND = _dumps({"error": "Missing 'command' field"})
+_ERR_UNKNOWN_COMMAND = _dumps({"error": "unknown command"})
+_ERR_UNENCODABLE_COMMAND = _dumps({"error": "command cannot be encoded as JSON"})
+_ERR_EMPTY_BODY = _dumps({"error": "Empty body"})
+
+
+class RequestBodyError(ValueError):
+    """Raised by _read_body for a body that is refused without being read."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class AtomicWriteError(OSError):
+    """Raised when a durable atomic_write fails its precondition or readback check."""
+
+
+def _sha256_file(filepath: Path) -> str:
+    """Return the hex SHA-256 of filepath's contents, or "" if it is missing."""
+    try:
+        with open(filepath, "rb") as f:
+            # Chunked so hashing never holds a second full copy in memory
+            digest = hashlib.sha256()
+            for chunk in iter(lambda: f.read(64 * 1024), b""):
+                digest.update(chunk)
+            return digest.hexdigest()
+    except FileNotFoundError:
+        return ""
+
+
+@contextlib.contextmanager
+def atomic_writer(
+    filepath: Path,
+    durable: bool = False,
+    expected_prev_sha256: "str | None" = None,
+):
+    """Context manager yielding write(bytes) into a temp file renamed over filepath.
 
     WHY: The orchestrator reads commands.json and ralph.conf at arbitrary times.
     Without atomicity, it could read a half-written file and crash or misbehave.
-    os.replace() is atomic on POSIX systems within the same filesystem.
+    os.replace() is atomic on POSIX systems within the same filesystem. If the
+    body raises, the temp file is removed and filepath is untouched.
+
+    The temp name is built from the pid and _TMP_COUNTER instead of
+    tempfile.mkstemp's random names; O_EXCL collisions with stale temp files
+    just advance the counter. write() goes
+    straight to os.write, so callers can stream slices (e.g. memoryviews)
+    without building the whole file in memory.
+
+    durable=True adds the crash-safety steps the fast path skips:
+      1. Precondition: if expected_prev_sha256 is given, the current file must
+         still hash to it ("" means "must not exist"), else AtomicWriteError.
+      2. fsync the temp file before closing it.
+      3. Read the temp file back and compare its SHA-256 to what was written.
+      4. Rename over the target, then fsync the directory so the rename itself
+         survives a crash.
     """
     filepath.parent.mkdir(parents=True, exist_ok=True)
-    fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, suffix=".tmp")
+    while True:
+        tmp_path = filepath.parent / f".{filepath.name}.{os.getpid()}.{next(_TMP_COUNTER)}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            break
+        except FileExistsError:
+            # Left by a killed process that had our pid (common for PID 1 in
+            # containers); skip to the next counter value
+            continue
+    digest = hashlib.sha256() if durable else None
+
+    def write(data) -> None:
+        if digest is not None:
+            digest.update(data)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+
     try:
-        with os.fdopen(fd, "w") as f:
-            f.write(data)
+        try:
+            yield write
+            if durable:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        if durable:
+            if _sha256_file(tmp_path) != digest.hexdigest():
+                raise AtomicWriteError(f"readback mismatch writing {filepath}")
+            if (expected_prev_sha256 is not None
+                    and _sha256_file(filepath) != expected_prev_sha256):
+                raise AtomicWriteError(f"{filepath} changed since it was read")
+
         os.replace(tmp_path, filepath)
-    except Exception:
+    except BaseException:
         os.unlink(tmp_path)
         raise
 
+    if durable and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(filepath.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
 
-def enqueue_command(command_obj: dict) -> dict:
-    """Append an operator command to the pending queue in commands.json.
 
-    The orchestrator's telemetry.sh process_control_commands() reads and clears
-    this queue at the top of each main loop iteration. Supported commands:
-    pause, resume, inject-note, skip-task.
+def atomic_write(
+    filepath: Path,
+    data: "str | bytes",
+    durable: bool = False,
+    expected_prev_sha256: "str | None" = None,
+) -> None:
+    """Write data atomically via temp-file-then-rename; see atomic_writer()."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    with atomic_writer(filepath, durable, expected_prev_sha256) as write:
+        write(data)
 
-    SIDE EFFECT: Mutates .ralph/control/commands.json on disk.
+
+def _stat_signature(filepath: Path):
+    """Return (inode, mtime_ns, size) for filepath, or None if it is missing."""
+    try:
+        st = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _load_control() -> dict:
+    """Return the cached commands.json contents, re-reading only when stale.
+
+    CALLER: Must hold _CONTROL_LOCK.
     """
-    CONTROL_FILE.parent.mkdir(parents=True, exist_ok=True)
+    global _CONTROL_STATE, _CONTROL_STAT
 
-    # Read current state
-    if CONTROL_FILE.exists():
-        with open(CONTROL_FILE, "r") as f:
-            control = json.load(f)
-    else:
+    signature = _stat_signature(CONTROL_FILE)
+    if _CONTROL_STATE is not None and signature == _CONTROL_STAT:
+        return _CONTROL_STATE
+
+    if signature is None:
         control = {"pending": []}
+    else:
+        with open(CONTROL_FILE, "rb") as f:
+            control = _loads(f.read())
 
     if "pending" not in control:
         control["pending"] = []
 
-    control["pending"].append(command_obj)
-
-    atomic_write(CONTROL_FILE, json.dumps(control, indent=2) + "\n")
+    _CONTROL_STATE = control
+    _CONTROL_STAT = signature
     return control
 
 
+@contextlib.contextmanager
+def _control_file_lock():
+    """Hold an exclusive advisory lock on CONTROL_LOCK_FILE.
+
+    WHY: The orchestrator rewrites commands.json when it clears processed
+    commands. Without a shared lock, a clear landing between our read and our
+    rename would be overwritten (resurrecting old commands) or would drop the
+    command we just appended. Degrades to no locking if neither fcntl nor
+    msvcrt is available.
+    """
+    CONTROL_LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
+    # "a" so opening never truncates a lock file another process holds
+    with open(CONTROL_LOCK_FILE, "a+b") as lk:
+        if fcntl is not None:
+            fcntl.flock(lk.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lk.fileno(), fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            lk.seek(0)
+            msvcrt.locking(lk.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lk.seek(0)
+                msvcrt.locking(lk.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            yield
+
+
+def _flush_commands(command_objs: list) -> None:
+    """Append command_objs to commands.json with a single atomic_write.
+
+    The read-modify-write runs under _control_file_lock() so it cannot
+    interleave with the orchestrator clearing the queue.
+
+    CALLER: The writer thread (_writer_loop), one call per coalesced batch.
+    SIDE EFFECT: Mutates .ralph/control/commands.json on disk.
+    """
+    global _CONTROL_STATE, _CONTROL_STAT
+
+    with _CONTROL_LOCK, _control_file_lock():
+        control = _load_control()
+        control["pending"].extend(command_objs)
+        try:
+            atomic_write(CONTROL_FILE, _dumps(control, pretty=_PRETTY_CONTROL_JSON) + b"\n")
+        except Exception:
+            # Disk and cache now disagree; drop the cache so the next call
+            # starts from whatever is actually on disk.
+            _CONTROL_STATE = None
+            raise
+        _CONTROL_STAT = _stat_signature(CONTROL_FILE)
+
+
+def _writer_loop() -> None:
+    """Drain _write_queue forever, coalescing bursts into one write each."""
+    while True:
+        batches = [_write_queue.get()]
+        time.sleep(_COALESCE_SECONDS)
+        while True:
+            try:
+                batches.append(_write_queue.get_nowait())
+            except queue.Empty:
+                break
+        while True:
+            try:
+                _flush_commands([cmd for batch in batches for cmd in batch])
+                break
+            except Exception as e:
+                # Requests were already answered, so keep the batches and
+                # retry; anything queued meanwhile joins the next attempt.
+                sys.stderr.write(
+                    f"[ralph-serve] failed to write {CONTROL_FILE}: {e}; "
+                    f"retrying in {_RETRY_SECONDS:g}s\n"
+                )
+                time.sleep(_RETRY_SECONDS)
+                while True:
+                    try:
+                        batches.append(_write_queue.get_nowait())
+                    except queue.Empty:
+                        break
+        for _ in batches:
+            _write_queue.task_done()
+
+
+def _ensure_writer() -> None:
+    """Start the writer thread on first use.
+
+    Uses its own lock, never _CONTROL_LOCK: the writer holds that one across
+    flock waits and disk I/O, and request threads must not queue behind it.
+    """
+    global _writer_thread
+
+    if _writer_thread is not None:
+        return
+    with _WRITER_START_LOCK:
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(
+                target=_writer_loop, name="ralph-command-writer", daemon=True
+            )
+            _writer_thread.start()
+
+
+def flush_pending_writes(timeout: float = _FLUSH_TIMEOUT_SECONDS) -> None:
+    """Wait up to timeout seconds for every queued command to be written.
+
+    The writer retries failed flushes indefinitely, so an unbounded join()
+    could hang shutdown forever on a persistently unwritable file.
+    """
+    waiter = threading.Thread(target=_write_queue.join, daemon=True)
+    waiter.start()
+    waiter.join(timeout)
+    if waiter.is_alive():
+        sys.stderr.write(
+            f"[ralph-serve] gave up waiting for {CONTROL_FILE}; "
+            f"{_write_queue.unfinished_tasks} command batch(es) not written\n"
+        )
+
+
+def enqueue_commands(command_objs: list) -> dict:
+    """Queue a batch of operator commands for the pending queue in commands.json.
+
+    The orchestrator's telemetry.sh process_control_commands() reads and clears
+    this queue at the top of each main loop iteration. Supported commands:
+    pause, resume, inject-note, skip-task.
+
+    Accepted commands are handed to the writer thread and this returns
+    immediately; the file is updated within ~_COALESCE_SECONDS, and commands
+    from concurrent requests share one atomic_write. That is safe because the
+    orchestrator only polls the file between iterations.
+
+    Returns {"accepted": [...], "rejected": [...], "queued": N} where
+    accepted/rejected are indices into command_objs. Entries that are not an
+    object naming one of _VALID_COMMANDS, or that cannot be encoded as JSON,
+    are rejected; if none are accepted, nothing is queued.
+
+    SIDE EFFECT: Mutates .ralph/control/commands.json on disk (asynchronously).
+    """
+    accepted, rejected = [], []
+    for i, command_obj in enumerate(command_objs):
+        if isinstance(command_obj, dict) and command_obj.get("command") in _VALID_COMMANDS:
+            # Encode here, wrapped as it will sit in commands.json, so a bad
+            # entry is refused now instead of failing the writer's merged
+            # write for every other request in the batch.
+            try:
+                _dumps({"pending": [command_obj]})
+            except (TypeError, ValueError, OverflowError, RecursionError):
+                rejected.append(i)
+                continue
+            accepted.append(i)
+        else:
+            rejected.append(i)
+
+    if accepted:
+        _ensure_writer()
+        _write_queue.put([command_objs[i] for i in accepted])
+
+    return {"accepted": accepted, "rejected": rejected, "queued": len(accepted)}
+
+
+def enqueue_command(command_obj: dict) -> dict:
+    """Append a single operator command; see enqueue_commands().
+
+    Returns {"queued": 1}, or {"error": ...} without queuing anything if the
+    command is not one of _VALID_COMMANDS or cannot be encoded as JSON.
+    """
+    if command_obj.get("command") not in _VALID_COMMANDS:
+        return {"error": "unknown command"}
+    result = enqueue_commands([command_obj])
+    if result["rejected"]:
+        return {"error": "command cannot be encoded as JSON"}
+    return {"queued": result["queued"]}
+
+
+def _has_key_line(mm, keys) -> bool:
+    """True if some line of mm starts with KEY= for a (bytes) key in keys.
+
+    bytes.find() over the mmap, so the common "nothing to change" case never
+    copies or decodes the file.
+    """
+    for key in keys:
+        needle = key + b"="
+        if mm[:len(needle)] == needle or mm.find(b"\n" + needle) != -1:
+            return True
+    return False
+
+
 def update_settings(settings: dict) -> dict:
-    """Update whitelisted settings in ralph.conf via regex line replacement.
+    """Update whitelisted settings in ralph.conf via a single-pass streamed rewrite.
 
     Only settings in ALLOWED_SETTINGS can be modified (prevents arbitrary config
     injection). Values are sanitized to alphanumeric + hyphens + underscores.
+    A matching KEY=... line is replaced wholesale with KEY="value"; keys that
+    are not already present in the file are ignored.
+
+    The file is mmapped and streamed into the temp file: unchanged spans go
+    out as memoryview slices of the mapping, so no second in-memory copy of
+    the config is built.
 
     SIDE EFFECT: Mutates .ralph/config/ralph.conf on disk.
     CALLER: Dashboard settings panel via POST /api/settings.
@@ -100,37 +561,111 @@ def update_settings(settings: dict) -> dict:
     if not CONFIG_FILE.exists():
         return {"error": "ralph.conf not found"}
 
-    with open(CONFIG_FILE, "r") as f:
-        content = f.read()
-
-    # Whitelist: only these settings can be changed from the dashboard
-    ALLOWED_SETTINGS = {
-        "RALPH_VALIDATION_STRATEGY",
-        "RALPH_COMPACTION_INTERVAL",
-        "RALPH_COMPACTION_THRESHOLD_BYTES",
-        "RALPH_DEFAULT_MAX_TURNS",
-        "RALPH_MIN_DELAY_SECONDS",
-        "RALPH_MODE",
-    }
-
-    updated = []
+    # Validate first so the file scan only has to do dict lookups
+    pending = {}
     for key, value in settings.items():
         if key not in ALLOWED_SETTINGS:
             continue
         # Sanitize: reject values that could inject shell syntax
         safe_value = str(value)
-        if not re.match(r'^[a-zA-Z0-9_\-]+$', safe_value):
+        if not _VALUE_RE.match(safe_value):
             continue
-        # Replace existing line (must already exist in config)
-        pattern = re.compile(rf'^({re.escape(key)}=).*$', re.MULTILINE)
-        if pattern.search(content):
-            content = pattern.sub(rf'\g<1>"{safe_value}"', content)
-            updated.append(key)
+        pending[key.encode("ascii")] = f'{key}="{safe_value}"'.encode("ascii")
+
+    if not pending:
+        return {"updated": []}
+
+    found = set()
+    # Held across read, rewrite and rename so concurrent requests can't race
+    # each other into an AtomicWriteError or a lost update
+    with _CONFIG_LOCK:
+        fd = os.open(CONFIG_FILE, os.O_RDONLY)
+        try:
+            if os.fstat(fd).st_size == 0:
+                return {"updated": []}  # mmap cannot map an empty file
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                if not _has_key_line(mm, pending):
+                    return {"updated": []}
+
+                # ralph.conf is rarely written and must survive a crash intact;
+                # also refuse to clobber an edit made outside serve.py between
+                # our read and our write.
+                with memoryview(mm) as view, atomic_writer(
+                    CONFIG_FILE,
+                    durable=True,
+                    expected_prev_sha256=hashlib.sha256(mm).hexdigest(),
+                ) as write:
+                    size = len(mm)
+                    copied = pos = 0
+                    while pos < size:
+                        end = mm.find(b"\n", pos)
+                        if end == -1:
+                            end = size
+                        eq = mm.find(b"=", pos, end)
+                        if eq != -1:
+                            key = mm[pos:eq]
+                            if key in pending:
+                                write(view[copied:pos])
+                                write(pending[key])
+                                copied = end  # the newline itself passes through
+                                found.add(key)
+                        pos = end + 1
+                    write(view[copied:])
+        finally:
+            os.close(fd)
+
+    # Preserve request order in the response
+    return {"updated": [key.decode("ascii") for key in pending if key in found]}
+
+
+def _command_response(body: dict) -> "tuple[int, bytes]":
+    """POST /api/command: enqueue one command or a {"commands": [...]} batch."""
+    # Batch form: {"commands": [{...}, ...]} costs one write for all
+    if isinstance(body.get("commands"), list):
+        result = enqueue_commands(body["commands"])
+        if not result["accepted"]:
+            return 400, _dumps({"error": "No valid commands", **result})
+        return 200, _dumps({"ok": True, **result})
+    if "command" not in body:
+        return 400, _ERR_MISSING_COMMAND
+    result = enqueue_command(body)
+    if "error" in result:
+        if result["error"] == "unknown command":
+            return 400, _ERR_UNKNOWN_COMMAND
+        return 400, _ERR_UNENCODABLE_COMMAND
+    return 200, _dumps({"ok": True, **result})
+
 
-    if updated:
-        atomic_write(CONFIG_FILE, content)
+def _settings_response(body: dict) -> "tuple[int, bytes]":
+    """POST /api/settings: apply whitelisted ralph.conf updates."""
+    if not body:
+        return 400, _ERR_EMPTY_BODY
+    result = update_settings(body)
+    return 200, _dumps({"ok": True, **result})
 
-    return {"updated": updated}
+
+_API_ROUTES = {
+    "/api/command": _command_response,
+    "/api/settings": _settings_response,
+}
+
+
+def api_response(path: str, raw: bytes) -> "tuple[int, bytes]":
+    """Run the POST handler for path on a raw request body.
+
+    Shared by RalphHandler and the ASGI app so both servers answer the API
+    identically. Returns (status, encoded JSON body); path must be a key of
+    _API_ROUTES.
+    """
+    try:
+        body = _loads(raw) if raw else {}
+        if not isinstance(body, dict):
+            return 400, _ERR_NOT_OBJECT
+        return _API_ROUTES[path](body)
+    except json.JSONDecodeError:
+        return 400, _ERR_INVALID_JSON
+    except Exception as e:
+        return 500, _dumps({"error": str(e)})
 
 
 class RalphHandler(SimpleHTTPRequestHandler):
@@ -138,34 +673,174 @@ class RalphHandler(SimpleHTTPRequestHandler):
 
     Static serving lets the dashboard poll state.json, plan.json, handoffs/,
     events.jsonl, progress-log.json directly as files.
+
+    HTTP/1.1 keeps the dashboard's polling connection open between requests.
+    Every response must therefore carry Content-Length (send_head and
+    _send_json both do) so the browser can find the end of each body.
     """
 
+    protocol_version = "HTTP/1.1"
+
+    # ETag for the static file currently being served; emitted by end_headers
+    _etag = None
+    # Content-Length announced for the current response; copyfile sends
+    # exactly this many bytes even if the file has grown since send_head
+    _content_length = None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=str(PROJECT_ROOT), **kwargs)
 
+    def send_head(self):
+        """Answer conditional GET/HEAD for static files with 304 when unchanged.
+
+        The ETag is derived from stat() alone (mtime_ns + size), so an
+        unchanged poll costs one stat and a headers-only response. Everything
+        else (directories, missing files, the 200 path) is left to
+        SimpleHTTPRequestHandler.send_head.
+        """
+        self._etag = None
+        self._content_length = None
+        try:
+            st = os.stat(self.translate_path(self.path))
+        except OSError:
+            return super().send_head()
+        if not stat.S_ISREG(st.st_mode):
+            return super().send_head()
+
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        self._etag = etag
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if etag in candidates or "*" in candidates:
+                self.send_response(304)
+                self.end_headers()
+                return None
+        return super().send_head()
+
+    def send_error(self, code, message=None, explain=None):
+        # send_head may have picked an ETag before the open failed or the path
+        # hit a 404 branch; it describes the file, not this error page
+        self._etag = None
+        super().send_error(code, message, explain)
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == "content-length":
+            self._content_length = int(value)
+        super().send_header(keyword, value)
+
+    def end_headers(self):
+        if self._etag is not None:
+            self.send_header("ETag", self._etag)
+            self._etag = None
+        super().end_headers()
+
+    def copyfile(self, source, outputfile):
+        """Stream a static file to the client with os.sendfile() when possible.
+
+        sendfile lets the kernel copy page cache straight to the socket instead
+        of bouncing 16 KiB chunks through user space. Falls back to a 64 KiB
+        read/write loop when sendfile or a real fd is unavailable (e.g. Windows).
+
+        Exactly the Content-Length sent by send_head goes out: append-only
+        files like events.jsonl can grow in between, and any extra bytes would
+        be read as the start of the next response on a keep-alive connection.
+        """
+        remaining = self._content_length
+        if remaining is None:
+            super().copyfile(source, outputfile)
+            return
+        try:
+            in_fd = source.fileno()
+            out_fd = outputfile.fileno()
+            offset = source.tell()
+            sendfile = os.sendfile
+        except (AttributeError, OSError):
+            self._copy_bounded(source, outputfile, remaining)
+            return
+
+        first = True
+        while remaining > 0:
+            try:
+                sent = sendfile(out_fd, in_fd, offset, remaining)
+            except OSError:
+                # Only safe to fall back before anything reached the socket
+                if not first:
+                    raise
+                self._copy_bounded(source, outputfile, remaining)
+                return
+            if sent == 0:
+                # File was truncated; the body is short, so end the connection
+                # rather than leave the client waiting for missing bytes
+                self.close_connection = True
+                break
+            first = False
+            offset += sent
+            remaining -= sent
+
+    def _copy_bounded(self, source, outputfile, remaining: int):
+        """copyfile fallback: copy at most remaining bytes in 64 KiB chunks."""
+        while remaining > 0:
+            chunk = source.read(min(64 * 1024, remaining))
+            if not chunk:
+                self.close_connection = True
+                break
+            outputfile.write(chunk)
+            remaining -= len(chunk)
+
     def do_POST(self):
-        if self.path == "/api/command":
-            self._handle_command()
-        elif self.path == "/api/settings":
-            self._handle_settings()
-        else:
+        if self.path not in _API_ROUTES:
             self.send_error(404, "Not Found")
+            return
+        try:
+            raw = self._read_body()
+        except RequestBodyError as e:
+            self._send_json(e.status, {"error": str(e)})
+            return
+        self._send_raw_json(*api_response(self.path, raw))
 
-    def _read_body(self) -> dict:
-        length = int(self.headers.get("Content-Length", 0))
+    def _read_body(self) -> bytes:
+        if "Transfer-Encoding" in self.headers:
+            # http.server does not decode chunked bodies; left unread, the
+            # chunks would be parsed as the next keep-alive request.
+            self.close_connection = True
+            raise RequestBodyError(411, "Content-Length required")
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY:
+            # The unread body would be parsed as the next keep-alive request
+            self.close_connection = True
+            if length < 0:
+                raise RequestBodyError(400, "Invalid Content-Length")
+            raise RequestBodyError(413, f"Body exceeds {MAX_BODY} bytes")
         if length == 0:
-            return {}
-        raw = self.rfile.read(length)
-        return json.loads(raw)
+            return b""
+        return self.rfile.read(length)
 
     def _send_json(self, status: int, data: dict):
-        body = json.dumps(data).encode("utf-8")
-        self.send_response(status)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(body)))
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.end_headers()
-        self.wfile.write(body)
+        self._send_raw_json(status, _dumps(data))
+
+    def _send_raw_json(self, status: int, body: bytes):
+        """Send an already-encoded JSON body (e.g. one of the _ERR_* constants).
+
+        Status line, headers and body are joined into one bytes object and
+        written with a single wfile.write(), instead of send_response /
+        send_header / end_headers followed by a separate body write.
+        """
+        self.log_request(status)
+        head = (
+            f"{self.protocol_version} {status} {self.responses[status][0]}\r\n"
+            f"Server: {self.version_string()}\r\n"
+            f"Date: {self.date_time_string()}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            f"Connection: {'close' if self.close_connection else 'keep-alive'}\r\n"
+            "\r\n"
+        )
+        self.wfile.write(head.encode("latin-1") + body)
 
     def do_OPTIONS(self):
         """Handle CORS preflight requests (dashboard may run on different port)."""
@@ -173,59 +848,215 @@ class RalphHandler(SimpleHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
-    def _handle_command(self):
-        try:
-            body = self._read_body()
-            if "command" not in body:
-                self._send_json(400, {"error": "Missing 'command' field"})
-                return
-            result = enqueue_command(body)
-            self._send_json(200, {"ok": True, "pending_count": len(result["pending"])})
-        except json.JSONDecodeError:
-            self._send_json(400, {"error": "Invalid JSON"})
-        except Exception as e:
-            self._send_json(500, {"error": str(e)})
-
-    def _handle_settings(self):
+    def log_message(self, format, *args):
+        """Suppress static file request logging; only log API calls.
+
+        Returns before any formatting so static polls pay nothing for logging.
+        self.path is unset when the request line itself was rejected.
+        """
+        if not getattr(self, "path", "").startswith("/api/"):
+            return
+        sys.stderr.write("[ralph-serve] %s %s\n" % (self.address_string(), format % args))
+
+
+class RalphServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that disables Nagle's algorithm on every connection.
+
+    With keep-alive, a small JSON reply can otherwise sit in the kernel waiting
+    for the client's delayed ACK of the previous segment (up to ~40ms).
+    """
+
+    daemon_threads = True
+
+    def process_request(self, request, client_address):
         try:
-            body = self._read_body()
-            if not body:
-                self._send_json(400, {"error": "Empty body"})
-                return
-            result = update_settings(body)
-            self._send_json(200, {"ok": True, **result})
-        except json.JSONDecodeError:
-            self._send_json(400, {"error": "Invalid JSON"})
-        except Exception as e:
-            self._send_json(500, {"error": str(e)})
+            request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (OSError, AttributeError):
+            pass  # not a TCP socket (e.g. AF_UNIX); nothing to tune
+        super().process_request(request, client_address)
+
+
+# --- Optional ASGI server -------------------------------------------------
+# When uvicorn is installed, main() serves the same routes through this raw
+# ASGI app instead of http.server: an event loop plus uvicorn's C HTTP parser
+# (httptools) and uvloop when those are present. The API logic is shared via
+# api_response(); disk work runs in the default executor so the loop never
+# blocks on it.
+
+_CORS_PREFLIGHT_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+    (b"access-control-allow-headers", b"Content-Type"),
+    (b"content-length", b"0"),
+]
 
-    def log_message(self, format, *args):
-        """Suppress static file request logging; only log API calls."""
-        if self.path.startswith("/api/"):
-            sys.stderr.write(f"[ralph-serve] {self.address_string()} {format % args}\n")
+
+async def _asgi_respond(send, status: int, headers: list, body: bytes = b"") -> None:
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _asgi_json(send, status: int, body: bytes, close: bool = False) -> None:
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("ascii")),
+        (b"access-control-allow-origin", b"*"),
+    ]
+    if close:
+        headers.append((b"connection", b"close"))
+    await _asgi_respond(send, status, headers, body)
+
+
+def _open_static(url_path: str):
+    """Open the file under PROJECT_ROOT for a decoded URL path.
+
+    Returns (file, stat_result), or None for anything outside the root or not
+    a regular file. Directories resolve to their index.html.
+    """
+    # ValueError: paths with an embedded NUL (GET /a%00b) can't be resolved
+    try:
+        candidate = (PROJECT_ROOT / url_path.lstrip("/")).resolve()
+        if candidate != PROJECT_ROOT and PROJECT_ROOT not in candidate.parents:
+            return None
+        if candidate.is_dir():
+            candidate = candidate / "index.html"
+        f = open(candidate, "rb")
+    except (OSError, ValueError):
+        return None
+    st = os.fstat(f.fileno())
+    if not stat.S_ISREG(st.st_mode):
+        f.close()
+        return None
+    return f, st
+
+
+async def _asgi_static(scope, send) -> None:
+    """GET/HEAD of a project file, with the same ETag/304 rule as RalphHandler."""
+    loop = asyncio.get_running_loop()
+    opened = await loop.run_in_executor(None, _open_static, scope["path"])
+    if opened is None:
+        await _asgi_respond(send, 404, [(b"content-length", b"0")])
+        return
+
+    f, st = opened
+    with f:
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'.encode("ascii")
+        headers = [(b"etag", etag)]
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                candidates = {tag.strip().removeprefix(b"W/") for tag in value.split(b",")}
+                if etag in candidates or b"*" in candidates:
+                    await _asgi_respond(send, 304, headers)
+                    return
+
+        content_type = mimetypes.guess_type(f.name)[0] or "application/octet-stream"
+        headers += [
+            (b"content-type", content_type.encode("ascii")),
+            (b"content-length", str(st.st_size).encode("ascii")),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        if scope["method"] == "HEAD":
+            await send({"type": "http.response.body", "body": b""})
+            return
+        # Stop at the announced length: append-only files like events.jsonl
+        # may grow while streaming, and an overrun aborts the connection
+        remaining = st.st_size
+        while remaining > 0:
+            chunk = await loop.run_in_executor(None, f.read, min(64 * 1024, remaining))
+            if not chunk:
+                break  # truncated meanwhile; the server drops the short response
+            remaining -= len(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+
+async def _asgi_api(scope, receive, send) -> None:
+    """POST /api/*: bounded body read, then api_response() in a worker thread."""
+    for name, value in scope["headers"]:
+        if name == b"content-length" and value.isdigit() and int(value) > MAX_BODY:
+            await _asgi_json(send, 413, _dumps({"error": f"Body exceeds {MAX_BODY} bytes"}), close=True)
+            return
+
+    raw = bytearray()
+    more_body = True
+    while more_body:
+        message = await receive()
+        raw += message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if len(raw) > MAX_BODY:
+            await _asgi_json(send, 413, _dumps({"error": f"Body exceeds {MAX_BODY} bytes"}), close=True)
+            return
+
+    loop = asyncio.get_running_loop()
+    status, body = await loop.run_in_executor(None, api_response, scope["path"], bytes(raw))
+    client = scope.get("client") or ("-", 0)
+    sys.stderr.write(f'[ralph-serve] {client[0]} "POST {scope["path"]}" {status}\n')
+    await _asgi_json(send, status, body)
+
+
+async def asgi_app(scope, receive, send) -> None:
+    """ASGI entry point mirroring RalphHandler's routes."""
+    if scope["type"] != "http":
+        return
+    method = scope["method"]
+    if method == "OPTIONS":
+        await _asgi_respond(send, 204, _CORS_PREFLIGHT_HEADERS)
+    elif method == "POST" and scope["path"] in _API_ROUTES:
+        await _asgi_api(scope, receive, send)
+    elif method in ("GET", "HEAD"):
+        await _asgi_static(scope, send)
+    else:
+        await _asgi_respond(send, 404 if method == "POST" else 501, [(b"content-length", b"0")])
 
 
 def main():
     parser = argparse.ArgumentParser(description="Ralph Deluxe dashboard server")
     parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
     parser.add_argument("--bind", default="127.0.0.1", help="Address to bind to")
+    parser.add_argument(
+        "--server", choices=("auto", "uvicorn", "stdlib"), default="auto",
+        help="HTTP backend: uvicorn if installed (auto), or the stdlib http.server",
+    )
     args = parser.parse_args()
 
+    if args.server == "uvicorn" and uvicorn is None:
+        parser.error("--server uvicorn requires the uvicorn package")
+
     os.chdir(PROJECT_ROOT)
 
-    server = HTTPServer((args.bind, args.port), RalphHandler)
-    print(f"Ralph Deluxe server running at http://{args.bind}:{args.port}/")
+    use_uvicorn = uvicorn is not None and args.server != "stdlib"
+    print(f"Ralph Deluxe server running at http://{args.bind}:{args.port}/"
+          f" ({'uvicorn' if use_uvicorn else 'http.server'})")
     print(f"Dashboard: http://{args.bind}:{args.port}/.ralph/dashboard.html")
     print(f"Project root: {PROJECT_ROOT}")
     print("Press Ctrl+C to stop.")
 
+    if use_uvicorn:
+        try:
+            # "auto" picks uvloop/httptools when installed, asyncio/h11 otherwise
+            uvicorn.run(
+                asgi_app, host=args.bind, port=args.port, workers=1,
+                loop="auto", http="auto", lifespan="off",
+                access_log=False, log_level="warning",
+            )
+        finally:
+            flush_pending_writes()
+        return
+
+    # Threaded so a slow static read never blocks an API write; daemon threads
+    # let idle keep-alive connections die with the process on Ctrl+C.
+    server = RalphServer((args.bind, args.port), RalphHandler)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down.")
         server.shutdown()
+    finally:
+        # Don't lose commands still sitting in the coalescing window
+        flush_pending_writes()
 
 
 if __name__ == "__main__":
@@ -160,6 +160,16 @@ EOF
     [[ "$count" -eq 0 ]]
 }
 
+@test "clear_pending_commands with a count keeps later commands queued" {
+    cat > "$RALPH_CONTROL_FILE" <<'EOF'
+{"pending":[{"command":"pause"},{"command":"resume"},{"command":"inject-note","note":"late"}]}
+EOF
+    clear_pending_commands 2
+    local remaining
+    remaining="$(jq -c '.pending' "$RALPH_CONTROL_FILE")"
+    [[ "$remaining" == '[{"command":"inject-note","note":"late"}]' ]]
+}
+
 @test "clear_pending_commands is safe when file does not exist" {
     rm -f "$RALPH_CONTROL_FILE"
     run clear_pending_commands